@@ -0,0 +1,18 @@
+from app.domain.history.models import (
+    HistoryQuery,
+    HistoryRecord,
+    HistoryResponse,
+    HistorySettings,
+)
+from app.domain.history.service import HistoryService
+from app.domain.history.store import HistoryStore, get_history_store
+
+__all__ = [
+    "HistoryService",
+    "HistoryStore",
+    "HistoryQuery",
+    "HistoryRecord",
+    "HistoryResponse",
+    "HistorySettings",
+    "get_history_store",
+]
@@ -0,0 +1,53 @@
+import os
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.domain.lookingglass.models import DiagnosticSummary, NetworkTarget
+
+MAX_QUERY_LIMIT = 1000
+
+
+class HistorySettings(BaseModel):
+    """Configuration settings for the diagnostic history store."""
+
+    enabled: bool = Field(
+        default_factory=lambda: os.getenv("HISTORY_ENABLED", "false").lower() == "true"
+    )
+    db_path: str = Field(
+        default_factory=lambda: os.getenv("HISTORY_DB_PATH", "data/history.db")
+    )
+    max_age_days: float = Field(
+        default_factory=lambda: float(os.getenv("HISTORY_MAX_AGE_DAYS", "30"))
+    )
+    max_size_mb: float = Field(
+        default_factory=lambda: float(os.getenv("HISTORY_MAX_SIZE_MB", "100"))
+    )
+    batch_size: int = Field(
+        default_factory=lambda: int(os.getenv("HISTORY_BATCH_SIZE", "50"))
+    )
+    flush_interval: float = Field(
+        default_factory=lambda: float(os.getenv("HISTORY_FLUSH_INTERVAL", "2"))
+    )
+
+
+class HistoryQuery(NetworkTarget):
+    """Query parameters for looking up past diagnostic runs of a target."""
+
+    tool: str | None = Field(default=None, description="Filter by tool name")
+    since: datetime | None = Field(default=None, description="Earliest start time")
+    until: datetime | None = Field(default=None, description="Latest start time")
+    limit: int = Field(default=100, ge=1, le=MAX_QUERY_LIMIT)
+
+
+class HistoryRecord(DiagnosticSummary):
+    """A diagnostic summary as persisted in the history store."""
+
+    id: int
+
+
+class HistoryResponse(BaseModel):
+    """Response model for a history query, newest runs first."""
+
+    target: str
+    records: list[HistoryRecord]
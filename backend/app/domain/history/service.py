@@ -0,0 +1,26 @@
+from app.domain.history.models import HistoryQuery, HistoryResponse
+from app.domain.history.store import HistoryStore, get_history_store
+
+
+class HistoryService:
+    """Service for querying past diagnostic runs."""
+
+    def __init__(self) -> None:
+        self.store: HistoryStore | None = get_history_store()
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    async def get_history(self, query: HistoryQuery) -> HistoryResponse:
+        """
+        Look up stored runs for a target, newest first.
+
+        Args:
+            query: Target and optional tool/time-range filters.
+        """
+        if self.store is None:
+            raise RuntimeError("History store is disabled")
+
+        records = await self.store.query(query)
+        return HistoryResponse(target=query.target, records=records)
@@ -0,0 +1,255 @@
+import asyncio
+import contextlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncGenerator
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+from app.domain.history.models import HistoryQuery, HistoryRecord, HistorySettings
+from app.domain.lookingglass.models import DiagnosticSummary, HopSummary
+from app.domain.lookingglass.parsers import summarize_output
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    target TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    packets_sent INTEGER,
+    packets_received INTEGER,
+    loss_percent REAL,
+    rtt_min REAL,
+    rtt_avg REAL,
+    rtt_max REAL,
+    rtt_mdev REAL,
+    hops TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_target_started_at ON runs (target, started_at);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+"""
+
+COLUMNS = (
+    "target",
+    "tool",
+    "started_at",
+    "duration",
+    "packets_sent",
+    "packets_received",
+    "loss_percent",
+    "rtt_min",
+    "rtt_avg",
+    "rtt_max",
+    "rtt_mdev",
+    "hops",
+)
+
+INSERT_SQL = (
+    f"INSERT INTO runs ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in COLUMNS)})"
+)
+
+SECONDS_PER_DAY = 86400
+BYTES_PER_MB = 1024 * 1024
+PRUNE_FRACTION = 0.1  # Share of rows dropped per pass when over the size limit
+
+
+class HistoryStore:
+    """
+    Append-only SQLite store for parsed diagnostic summaries.
+
+    Summaries are buffered in memory and written in batches from a worker
+    thread so the event loop never blocks on disk I/O.
+    """
+
+    def __init__(self, settings: HistorySettings) -> None:
+        self.settings = settings
+        self._pending: list[DiagnosticSummary] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        self._flush_requested = asyncio.Event()
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def record(self, summary: DiagnosticSummary) -> None:
+        """Queue a summary for the next batched write."""
+        self._pending.append(summary)
+        if len(self._pending) >= self.settings.batch_size:
+            self._flush_requested.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def record_stream(
+        self, stream: AsyncGenerator[bytes, None], tool: str, target: str
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Pass a diagnostic output stream through unchanged and queue its parsed
+        summary once the command has finished. Runs aborted by the client are
+        not recorded.
+        """
+        started_at = time.time()
+        chunks: list[bytes] = []
+        finished = False
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+            finished = True
+        except RuntimeError:
+            # Non-zero exit codes (e.g. 100% ping loss) still carry statistics
+            finished = True
+            raise
+        finally:
+            if finished:
+                # Chunks need not be single lines, and a multi-byte character
+                # may be split across two of them, so decode the output whole
+                output = b"".join(chunks).decode(errors="replace").splitlines()
+                summary = summarize_output(
+                    tool, target, output, started_at, time.time()
+                )
+                if summary is not None:
+                    self.record(summary)
+
+    async def _flush_later(self) -> None:
+        # Keep going while summaries arrive during a write; record() only
+        # starts a new task once this one has finished.
+        while self._pending:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.settings.flush_interval
+                )
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to write diagnostic history")
+
+    async def flush(self) -> None:
+        """Write all queued summaries to disk."""
+        batch, self._pending = self._pending, []
+        if batch:
+            await asyncio.to_thread(self._write_batch, batch)
+
+    async def query(self, query: HistoryQuery) -> list[HistoryRecord]:
+        """Return stored runs for a target, newest first."""
+        await self.flush()
+        return await asyncio.to_thread(self._select, query)
+
+    async def close(self) -> None:
+        """Flush outstanding summaries and close the database."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            path = Path(self.settings.db_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(path, check_same_thread=False)
+            # auto_vacuum only takes effect before the first table is created
+            connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _write_batch(self, batch: list[DiagnosticSummary]) -> None:
+        rows = [
+            (
+                summary.target,
+                summary.tool,
+                summary.started_at.timestamp(),
+                summary.duration,
+                summary.packets_sent,
+                summary.packets_received,
+                summary.loss_percent,
+                summary.rtt_min,
+                summary.rtt_avg,
+                summary.rtt_max,
+                summary.rtt_mdev,
+                json.dumps(
+                    [hop.model_dump(exclude_none=True) for hop in summary.hops],
+                    separators=(",", ":"),
+                ),
+            )
+            for summary in batch
+        ]
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(INSERT_SQL, rows)
+                self._prune(connection)
+            # Each result row frees one page, so step the pragma to completion
+            connection.execute("PRAGMA incremental_vacuum").fetchall()
+
+    def _prune(self, connection: sqlite3.Connection) -> None:
+        """Enforce the age and size retention limits."""
+        cutoff = time.time() - self.settings.max_age_days * SECONDS_PER_DAY
+        connection.execute("DELETE FROM runs WHERE started_at < ?", (cutoff,))
+
+        max_bytes = self.settings.max_size_mb * BYTES_PER_MB
+        while self._used_bytes(connection) > max_bytes:
+            (count,) = connection.execute("SELECT COUNT(*) FROM runs").fetchone()
+            if count == 0:
+                break
+            connection.execute(
+                "DELETE FROM runs WHERE id IN "
+                "(SELECT id FROM runs ORDER BY started_at LIMIT ?)",
+                (max(1, int(count * PRUNE_FRACTION)),),
+            )
+
+    @staticmethod
+    def _used_bytes(connection: sqlite3.Connection) -> int:
+        (page_size,) = connection.execute("PRAGMA page_size").fetchone()
+        (page_count,) = connection.execute("PRAGMA page_count").fetchone()
+        (free_pages,) = connection.execute("PRAGMA freelist_count").fetchone()
+        return int(page_size * (page_count - free_pages))
+
+    def _select(self, query: HistoryQuery) -> list[HistoryRecord]:
+        sql = f"SELECT id, {', '.join(COLUMNS)} FROM runs WHERE target = ?"
+        params: list[str | float | int] = [query.target]
+        if query.since is not None:
+            sql += " AND started_at >= ?"
+            params.append(query.since.timestamp())
+        if query.until is not None:
+            sql += " AND started_at <= ?"
+            params.append(query.until.timestamp())
+        if query.tool is not None:
+            sql += " AND tool = ?"
+            params.append(query.tool)
+        sql += " ORDER BY started_at DESC LIMIT ?"
+        params.append(query.limit)
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+
+        records = []
+        for row_id, *values in rows:
+            fields = dict(zip(COLUMNS, values, strict=True))
+            fields["started_at"] = datetime.fromtimestamp(
+                fields["started_at"], tz=timezone.utc
+            )
+            fields["hops"] = [HopSummary(**hop) for hop in json.loads(fields["hops"])]
+            records.append(HistoryRecord(id=row_id, **fields))
+        return records
+
+
+@lru_cache
+def get_history_store() -> HistoryStore | None:
+    """Shared history store, or None when history is disabled."""
+    settings = HistorySettings()
+    if not settings.enabled:
+        return None
+    return HistoryStore(settings)
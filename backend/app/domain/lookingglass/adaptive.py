@@ -0,0 +1,273 @@
+import math
+import re
+import signal
+import socket
+import statistics
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.domain.lookingglass.parsers import MTR_UNKNOWN_HOST, MTR_UNKNOWN_LOSS
+
+PING_REPLY_PATTERN: re.Pattern[str] = re.compile(r"icmp_seq=(\d+).*?time=([\d.]+) ms")
+PING_SEQ_PATTERN: re.Pattern[str] = re.compile(r"icmp_seq=(\d+)")
+MTR_RAW_PATTERN: re.Pattern[str] = re.compile(r"^([a-z]) (\d+) (\S+)(?: (\d+))?$")
+USEC_PER_MS = 1000
+
+
+class AdaptiveBounds(BaseModel):
+    """Thresholds that decide when a probe result has converged"""
+
+    min_probes: int = Field(description="Probes required before stopping early")
+    unreachable_probes: int = Field(
+        description="Unanswered probes after which a target counts as unreachable"
+    )
+    rtt_tolerance: float = Field(
+        description="Max confidence interval half-width relative to the mean RTT"
+    )
+    loss_tolerance: float = Field(
+        description="Max distance between the loss ratio and its Wilson bounds"
+    )
+    confidence_z: float = Field(description="z-score of the confidence level")
+
+
+def wilson_interval(failures: int, trials: int, z: float) -> tuple[float, float]:
+    """Wilson score interval for a binomial proportion."""
+    if not trials:
+        return 0.0, 1.0
+    ratio = failures / trials
+    denominator = 1 + z**2 / trials
+    center = (ratio + z**2 / (2 * trials)) / denominator
+    margin = (
+        z
+        * math.sqrt(ratio * (1 - ratio) / trials + z**2 / (4 * trials**2))
+        / denominator
+    )
+    return max(center - margin, 0.0), min(center + margin, 1.0)
+
+
+class ProbeTracker:
+    """
+    Running loss and RTT estimate for a single probed host.
+
+    Loss can only be measured when transmitted probes are visible in the
+    output. Trackers created with loss_known=False report unknown loss until
+    the first transmit record arrives.
+    """
+
+    def __init__(self, loss_known: bool = True) -> None:
+        self.loss_known = loss_known
+        self.sent: set[int] = set()
+        self.lost: set[int] = set()
+        self.rtts: dict[int, float] = {}
+
+    def on_sent(self, seq: int) -> None:
+        self.loss_known = True
+        self.sent.add(seq)
+
+    def on_reply(self, seq: int, rtt: float) -> None:
+        self.sent.add(seq)
+        self.rtts[seq] = rtt
+
+    def on_lost(self, seq: int) -> None:
+        self.sent.add(seq)
+        self.lost.add(seq)
+
+    @property
+    def resolved(self) -> int:
+        """Number of probes that were answered or are known to be lost."""
+        if not self.sent:
+            return 0
+        latest = max(self.sent)
+        in_flight = latest not in self.rtts and latest not in self.lost
+        return len(self.sent) - int(in_flight)
+
+    @property
+    def received(self) -> int:
+        return len(self.rtts)
+
+    @property
+    def loss_ratio(self) -> float | None:
+        if not self.loss_known:
+            return None
+        resolved = self.resolved
+        if not resolved:
+            return 0.0
+        return max(resolved - self.received, 0) / resolved
+
+
+class AdaptiveMonitor(ABC):
+    """
+    Watches the output of a running probe and decides when the result has
+    converged, so the command can be stopped before its full probe count.
+    """
+
+    stop_signal: int = signal.SIGINT
+    # Exit codes that are expected once the command was stopped on purpose
+    stopped_exit_codes: tuple[int, ...] = (-signal.SIGINT,)
+
+    def __init__(self, bounds: AdaptiveBounds) -> None:
+        self.bounds = bounds
+        self.stop_reason: str | None = None
+
+    @abstractmethod
+    def observe(self, line: bytes) -> bytes | None:
+        """Inspect an output line and return what should be streamed."""
+
+    def summary(self) -> bytes:
+        """Trailer streamed after the command has exited."""
+        if self.stop_reason is None:
+            return b""
+        return f"\n--- Adaptive mode: stopped early, {self.stop_reason} ---\n".encode()
+
+    def _evaluate(self, tracker: ProbeTracker) -> str | None:
+        """
+        Return a stop reason once the target is clearly unreachable, or once
+        both the loss ratio and the mean RTT are known within the configured
+        confidence bounds.
+        """
+        bounds = self.bounds
+        resolved = tracker.resolved
+        if tracker.received == 0:
+            if resolved >= bounds.unreachable_probes:
+                return f"no replies to {resolved} probes"
+            return None
+
+        if resolved < bounds.min_probes or tracker.received < 2:
+            return None
+
+        # Wilson rather than Wald bounds: the Wald interval collapses to zero
+        # width at 0% loss, which would let a handful of clean probes "prove"
+        # a lossless path.
+        loss = tracker.loss_ratio
+        if loss is None:
+            return None
+        loss_low, loss_high = wilson_interval(
+            resolved - tracker.received, resolved, bounds.confidence_z
+        )
+        if max(loss_high - loss, loss - loss_low) > bounds.loss_tolerance:
+            return None
+
+        rtts = list(tracker.rtts.values())
+        mean = statistics.mean(rtts)
+        rtt_margin = bounds.confidence_z * statistics.stdev(rtts) / math.sqrt(len(rtts))
+        if rtt_margin > bounds.rtt_tolerance * mean:
+            return None
+
+        return (
+            f"{loss * 100:.1f}% loss (upper bound {loss_high * 100:.1f}%) and "
+            f"{mean:.3f} ms average RTT converged after {resolved} probes"
+        )
+
+
+class PingMonitor(AdaptiveMonitor):
+    """
+    Adaptive monitor for iputils ping run with -O, so unanswered probes are
+    reported as they happen. SIGINT makes ping print its usual statistics.
+
+    ping handles SIGINT itself and exits normally: 0 when any reply arrived,
+    1 when none did. After an early stop for an unreachable target, exit
+    code 1 is the expected outcome and not a failure.
+    """
+
+    stopped_exit_codes = (0, 1)
+
+    def __init__(self, bounds: AdaptiveBounds) -> None:
+        super().__init__(bounds)
+        self.tracker = ProbeTracker()
+
+    def observe(self, line: bytes) -> bytes | None:
+        text = line.decode(errors="replace")
+        if match := PING_REPLY_PATTERN.search(text):
+            self.tracker.on_reply(int(match.group(1)), float(match.group(2)))
+        elif match := PING_SEQ_PATTERN.search(text):
+            # "no answer yet" and ICMP error lines both mean the probe was lost
+            self.tracker.on_lost(int(match.group(1)))
+        else:
+            return line
+
+        if self.stop_reason is None:
+            self.stop_reason = self._evaluate(self.tracker)
+        return line
+
+
+class MTRMonitor(AdaptiveMonitor):
+    """
+    Adaptive monitor for mtr run with --raw. Raw records are consumed here and
+    rendered as a regular mtr report once the command has exited.
+    """
+
+    stop_signal = signal.SIGTERM
+    stopped_exit_codes = (-signal.SIGTERM,)
+
+    def __init__(self, bounds: AdaptiveBounds) -> None:
+        super().__init__(bounds)
+        self.started_at = datetime.now().astimezone()
+        self.hops: dict[int, ProbeTracker] = {}
+        self.hosts: dict[int, str] = {}
+
+    def observe(self, line: bytes) -> bytes | None:
+        match = MTR_RAW_PATTERN.match(line.decode(errors="replace").strip())
+        if not match:
+            return line
+
+        kind, hop, value, seq = match.groups()
+        position = int(hop)
+        # mtr builds without transmit ("x") records give no way to count losses
+        tracker = self.hops.setdefault(position, ProbeTracker(loss_known=False))
+        if kind == "h":
+            self.hosts[position] = value
+        elif kind == "x":
+            tracker.on_sent(int(value))
+        elif kind == "p":
+            # Older mtr releases omit the sequence number on reply records
+            reply_seq = int(seq) if seq else max(tracker.sent, default=0)
+            tracker.on_reply(reply_seq, int(value) / USEC_PER_MS)
+
+        if self.stop_reason is None and kind in ("x", "p"):
+            final_hop = self._final_hop()
+            if final_hop is not None:
+                self.stop_reason = self._evaluate(self.hops[final_hop])
+        return None
+
+    def _final_hop(self) -> int | None:
+        """
+        Last hop that is probed every cycle. Hops that mtr only probed while
+        discovering the path, and the cycle currently being sent, are ignored.
+        """
+        if not self.hops:
+            return None
+        cycles = max(len(tracker.sent) for tracker in self.hops.values())
+        return max(
+            position
+            for position, tracker in self.hops.items()
+            if len(tracker.sent) >= cycles - 1
+        )
+
+    def summary(self) -> bytes:
+        final_hop = self._final_hop()
+        if final_hop is None:
+            return super().summary()
+
+        width = max(
+            [len(MTR_UNKNOWN_HOST), *(len(host) for host in self.hosts.values())]
+        )
+        lines = [
+            f"Start: {self.started_at.strftime('%Y-%m-%dT%H:%M:%S%z')}",
+            f"HOST: {socket.gethostname():<{width + 3}}"
+            " Loss%   Snt   Last   Avg  Best  Wrst StDev",
+        ]
+        for position in range(final_hop + 1):
+            tracker = self.hops.get(position, ProbeTracker(loss_known=False))
+            rtts = list(tracker.rtts.values()) or [0.0]
+            host = self.hosts.get(position, MTR_UNKNOWN_HOST)
+            loss = tracker.loss_ratio
+            loss_column = MTR_UNKNOWN_LOSS if loss is None else f"{loss * 100:.1f}%"
+            # Explicit separators keep columns apart once an RTT exceeds 1000 ms
+            lines.append(
+                f"{position + 1:3d}.|-- {host:<{width}} {loss_column:>6}"
+                f" {tracker.resolved:5d} {rtts[-1]:6.1f} {statistics.mean(rtts):5.1f}"
+                f" {min(rtts):5.1f} {max(rtts):5.1f} {statistics.pstdev(rtts):5.1f}"
+            )
+        return "\n".join(lines).encode() + b"\n" + super().summary()
@@ -1,4 +1,5 @@
 import re
+from datetime import datetime
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -44,3 +45,31 @@ class MTRRequest(NetworkTarget):
     """Request model for MTR - only accepts target"""
 
     pass  # Only inherits 'target' field from NetworkTarget
+
+
+class HopSummary(BaseModel):
+    """Parsed statistics for a single hop of a traceroute or MTR run"""
+
+    hop: int = Field(description="Hop number, starting at 1")
+    host: str | None = Field(default=None, description="Responding address")
+    loss_percent: float | None = None
+    rtt_avg: float | None = None
+    rtt_best: float | None = None
+    rtt_worst: float | None = None
+
+
+class DiagnosticSummary(BaseModel):
+    """Parsed summary of a completed ping, traceroute or MTR run"""
+
+    tool: str
+    target: str
+    started_at: datetime
+    duration: float = Field(description="Run duration in seconds")
+    packets_sent: int | None = None
+    packets_received: int | None = None
+    loss_percent: float | None = None
+    rtt_min: float | None = None
+    rtt_avg: float | None = None
+    rtt_max: float | None = None
+    rtt_mdev: float | None = None
+    hops: list[HopSummary] = Field(default_factory=list)
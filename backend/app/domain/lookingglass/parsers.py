@@ -0,0 +1,148 @@
+import re
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+from app.domain.lookingglass.models import DiagnosticSummary, HopSummary
+
+PING_STATS_PATTERN: re.Pattern[str] = re.compile(
+    r"(\d+) packets transmitted, (\d+) (?:packets )?received.*?"
+    r"([\d.]+)% packet loss"
+)
+PING_RTT_PATTERN: re.Pattern[str] = re.compile(
+    r"(?:rtt|round-trip) min/avg/max/(?:mdev|stddev) = "
+    r"([\d.]+)/([\d.]+)/([\d.]+)/([\d.]+) ms"
+)
+TRACEROUTE_HOP_PATTERN: re.Pattern[str] = re.compile(r"^\s*(\d+)\s+(.+)$")
+TRACEROUTE_ADDRESS_PATTERN: re.Pattern[str] = re.compile(r"\(([^)]+)\)")
+RTT_MS_PATTERN: re.Pattern[str] = re.compile(r"([\d.]+) ms")
+MTR_HOP_PATTERN: re.Pattern[str] = re.compile(
+    r"^\s*(\d+)\.\|--\s+(\S+)\s+([\d.]+|\?\?\?)%?\s+(\d+)"
+    r"\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)"
+)
+# Placeholders shared by mtr reports and the adaptive MTR renderer
+MTR_UNKNOWN_HOST = "???"
+MTR_UNKNOWN_LOSS = "???"
+
+
+def _parse_ping(lines: list[str], summary: DiagnosticSummary) -> bool:
+    found = False
+    for line in lines:
+        if match := PING_STATS_PATTERN.search(line):
+            summary.packets_sent = int(match.group(1))
+            summary.packets_received = int(match.group(2))
+            summary.loss_percent = float(match.group(3))
+            found = True
+        elif match := PING_RTT_PATTERN.search(line):
+            summary.rtt_min, summary.rtt_avg, summary.rtt_max, summary.rtt_mdev = (
+                float(value) for value in match.groups()
+            )
+    return found
+
+
+def _parse_traceroute(lines: list[str], summary: DiagnosticSummary) -> bool:
+    for line in lines:
+        match = TRACEROUTE_HOP_PATTERN.match(line)
+        if not match:
+            continue
+
+        rest = match.group(2)
+        rtts = [float(value) for value in RTT_MS_PATTERN.findall(rest)]
+        timeouts = rest.split().count("*")
+        probes = len(rtts) + timeouts
+
+        host = None
+        if address := TRACEROUTE_ADDRESS_PATTERN.search(rest):
+            host = address.group(1)
+        elif rtts:
+            host = rest.split()[0]
+
+        summary.hops.append(
+            HopSummary(
+                hop=int(match.group(1)),
+                host=host,
+                loss_percent=timeouts / probes * 100 if probes else None,
+                rtt_avg=sum(rtts) / len(rtts) if rtts else None,
+                rtt_best=min(rtts, default=None),
+                rtt_worst=max(rtts, default=None),
+            )
+        )
+
+    if not summary.hops:
+        return False
+
+    last_hop = summary.hops[-1]
+    summary.loss_percent = last_hop.loss_percent
+    summary.rtt_min = last_hop.rtt_best
+    summary.rtt_avg = last_hop.rtt_avg
+    summary.rtt_max = last_hop.rtt_worst
+    return True
+
+
+def _parse_mtr(lines: list[str], summary: DiagnosticSummary) -> bool:
+    for line in lines:
+        match = MTR_HOP_PATTERN.match(line)
+        if not match:
+            continue
+
+        host = match.group(2)
+        # Adaptive MTR reports "???" when loss could not be measured
+        loss_value = match.group(3)
+        loss_percent = None if loss_value == MTR_UNKNOWN_LOSS else float(loss_value)
+        answered = loss_percent is None or loss_percent < 100
+        summary.hops.append(
+            HopSummary(
+                hop=int(match.group(1)),
+                host=None if host == MTR_UNKNOWN_HOST else host,
+                loss_percent=loss_percent,
+                rtt_avg=float(match.group(6)) if answered else None,
+                rtt_best=float(match.group(7)) if answered else None,
+                rtt_worst=float(match.group(8)) if answered else None,
+            )
+        )
+        summary.packets_sent = int(match.group(4))
+        summary.rtt_mdev = float(match.group(9)) if answered else None
+
+    if not summary.hops:
+        return False
+
+    last_hop = summary.hops[-1]
+    summary.loss_percent = last_hop.loss_percent
+    summary.rtt_min = last_hop.rtt_best
+    summary.rtt_avg = last_hop.rtt_avg
+    summary.rtt_max = last_hop.rtt_worst
+    if summary.packets_sent is not None and summary.loss_percent is not None:
+        summary.packets_received = round(
+            summary.packets_sent * (100 - summary.loss_percent) / 100
+        )
+    return True
+
+
+def summarize_output(
+    tool: str,
+    target: str,
+    output: Iterable[str],
+    started_at: float,
+    finished_at: float,
+) -> DiagnosticSummary | None:
+    """
+    Parse the raw output of a diagnostic command into a summary.
+    Returns None when the output does not contain any usable statistics.
+    """
+    summary = DiagnosticSummary(
+        tool=tool,
+        target=target,
+        started_at=datetime.fromtimestamp(started_at, tz=timezone.utc),
+        duration=max(finished_at - started_at, 0.0),
+    )
+    lines = list(output)
+
+    if tool.startswith("ping"):
+        parsed = _parse_ping(lines, summary)
+    elif tool.startswith("traceroute"):
+        parsed = _parse_traceroute(lines, summary)
+    elif tool.startswith("mtr"):
+        parsed = _parse_mtr(lines, summary)
+    else:
+        parsed = False
+
+    return summary if parsed else None
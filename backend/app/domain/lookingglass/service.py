@@ -1,6 +1,13 @@
 import asyncio
+import contextlib
 from collections.abc import AsyncGenerator
 
+from app.domain.lookingglass.adaptive import (
+    AdaptiveBounds,
+    AdaptiveMonitor,
+    MTRMonitor,
+    PingMonitor,
+)
 from app.domain.lookingglass.models import MTRRequest, PingRequest, TracerouteRequest
 
 
@@ -17,20 +24,47 @@ class LookingGlassService:
 
     MTR_REPORT_CYCLES = 10
     MTR_NO_DNS = True  # Faster, avoids DNS lookups
+
+    # Adaptive mode: stop ping/MTR once the result has converged
+    ADAPTIVE_MODE = True
+    ADAPTIVE_MIN_PROBES = 8  # Never stop a reachable target before this
+    ADAPTIVE_UNREACHABLE_PROBES = 5  # Unanswered probes before giving up
+    ADAPTIVE_RTT_TOLERANCE = 0.1  # RTT CI half-width as a fraction of the mean
+    # Max gap between observed loss and its Wilson bounds; at 0% loss this
+    # first holds after 9 clean probes (upper bound under 30%)
+    ADAPTIVE_LOSS_TOLERANCE = 0.3
+    ADAPTIVE_CONFIDENCE_Z = 1.96  # 95% confidence
     MAX_CONCURRENT_TESTS = 20  # Limit total concurrent diagnostics
     _semaphore = asyncio.Semaphore(MAX_CONCURRENT_TESTS)
 
     def __init__(self) -> None:
         self.max_execution_time = 60  # Increased to accommodate longer operations
 
+    def _adaptive_bounds(self) -> AdaptiveBounds:
+        return AdaptiveBounds(
+            min_probes=self.ADAPTIVE_MIN_PROBES,
+            unreachable_probes=self.ADAPTIVE_UNREACHABLE_PROBES,
+            rtt_tolerance=self.ADAPTIVE_RTT_TOLERANCE,
+            loss_tolerance=self.ADAPTIVE_LOSS_TOLERANCE,
+            confidence_z=self.ADAPTIVE_CONFIDENCE_Z,
+        )
+
     async def _execute_command_stream(
-        self, cmd: list[str], command_name: str
+        self,
+        cmd: list[str],
+        command_name: str,
+        monitor: AdaptiveMonitor | None = None,
     ) -> AsyncGenerator[bytes, None]:
         """
         Execute a command and stream the output line by line as bytes.
         At the end, yield a message indicating success/failure/exit code.
+
+        When a monitor is given, every line passes through it first and the
+        command is signalled to stop as soon as the monitor reports that the
+        result has converged.
         """
         process = None
+        stopped_early = False
         try:
             try:
                 # Use semaphore to limit concurrency
@@ -53,7 +87,18 @@ class LookingGlassService:
                     )
                     if not line:
                         break
-                    yield line
+                    if monitor is None:
+                        yield line
+                        continue
+
+                    output = monitor.observe(line)
+                    if output:
+                        yield output
+                    if not stopped_early and monitor.stop_reason is not None:
+                        # Remaining output (e.g. ping statistics) is still read
+                        with contextlib.suppress(ProcessLookupError):
+                            process.send_signal(monitor.stop_signal)
+                        stopped_early = True
                 except asyncio.TimeoutError:
                     if process:
                         process.terminate()
@@ -74,7 +119,17 @@ class LookingGlassService:
                     return
 
             await process.wait()
-            if process.returncode != 0:
+            if monitor is not None:
+                # One chunk per line, like the command output itself
+                for summary_line in monitor.summary().splitlines(keepends=True):
+                    yield summary_line
+
+            stopped_by_monitor = (
+                stopped_early
+                and monitor is not None
+                and process.returncode in monitor.stopped_exit_codes
+            )
+            if process.returncode != 0 and not stopped_by_monitor:
                 msg = (
                     f"Command {command_name} failed with return code "
                     f"{process.returncode}"
@@ -102,10 +157,16 @@ class LookingGlassService:
             str(self.PING_TIMEOUT),
             "-s",
             str(self.PING_SIZE),
-            request.target,
         ]
 
-        async for chunk in self._execute_command_stream(cmd, "Ping"):
+        monitor = None
+        if self.ADAPTIVE_MODE:
+            cmd.append("-O")  # Report unanswered probes as they happen
+            monitor = PingMonitor(self._adaptive_bounds())
+
+        cmd.append(request.target)
+
+        async for chunk in self._execute_command_stream(cmd, "Ping", monitor):
             yield chunk
 
     async def ping6_stream(self, request: PingRequest) -> AsyncGenerator[bytes, None]:
@@ -121,10 +182,16 @@ class LookingGlassService:
             str(self.PING_TIMEOUT),
             "-s",
             str(self.PING_SIZE),
-            request.target,
         ]
 
-        async for chunk in self._execute_command_stream(cmd, "Ping6"):
+        monitor = None
+        if self.ADAPTIVE_MODE:
+            cmd.append("-O")  # Report unanswered probes as they happen
+            monitor = PingMonitor(self._adaptive_bounds())
+
+        cmd.append(request.target)
+
+        async for chunk in self._execute_command_stream(cmd, "Ping6", monitor):
             yield chunk
 
     async def traceroute_stream(
@@ -172,7 +239,7 @@ class LookingGlassService:
         """
         cmd = [
             "mtr",
-            "--report",
+            "--raw" if self.ADAPTIVE_MODE else "--report",
             "--report-cycles",
             str(self.MTR_REPORT_CYCLES),
         ]
@@ -182,7 +249,8 @@ class LookingGlassService:
 
         cmd.append(request.target)
 
-        async for chunk in self._execute_command_stream(cmd, "MTR"):
+        monitor = MTRMonitor(self._adaptive_bounds()) if self.ADAPTIVE_MODE else None
+        async for chunk in self._execute_command_stream(cmd, "MTR", monitor):
             yield chunk
 
     async def mtr6_stream(self, request: MTRRequest) -> AsyncGenerator[bytes, None]:
@@ -193,7 +261,7 @@ class LookingGlassService:
         cmd = [
             "mtr",
             "-6",  # Force IPv6
-            "--report",
+            "--raw" if self.ADAPTIVE_MODE else "--report",
             "--report-cycles",
             str(self.MTR_REPORT_CYCLES),
         ]
@@ -203,5 +271,6 @@ class LookingGlassService:
 
         cmd.append(request.target)
 
-        async for chunk in self._execute_command_stream(cmd, "MTR6"):
+        monitor = MTRMonitor(self._adaptive_bounds()) if self.ADAPTIVE_MODE else None
+        async for chunk in self._execute_command_stream(cmd, "MTR6", monitor):
             yield chunk
@@ -1,3 +1,6 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,6 +10,8 @@ from slowapi.middleware import SlowAPIMiddleware
 
 from app.core.config import get_settings
 from app.core.limiter import limiter
+from app.domain.history import get_history_store
+from app.routes.history import router as history_router
 from app.routes.lookingglass import router as lookingglass_router
 from app.routes.network import router as network_router
 from app.routes.speedtest import router as speedtest_router
@@ -14,7 +19,18 @@ from app.routes.speedtest import router as speedtest_router
 load_dotenv()
 
 settings = get_settings()
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Persist any diagnostic summaries still waiting for a batched write
+    store = get_history_store()
+    if store is not None:
+        await store.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS Configuration - Loaded from environment variables
 app.add_middleware(
@@ -32,6 +48,7 @@ app.add_middleware(SlowAPIMiddleware)
 app.include_router(speedtest_router)
 app.include_router(lookingglass_router)
 app.include_router(network_router)
+app.include_router(history_router)
 
 
 @app.get("/health")
@@ -0,0 +1,25 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from app.core.limiter import limiter
+from app.domain.history import HistoryQuery, HistoryResponse, HistoryService
+
+router = APIRouter(prefix="/history", tags=["History"])
+
+
+@router.get("", response_model=HistoryResponse)
+@limiter.limit("30/minute")
+async def get_history(
+    request: Request,
+    query: Annotated[HistoryQuery, Query()],
+    service: Annotated[HistoryService, Depends(HistoryService)],
+) -> HistoryResponse:
+    """
+    Return stored ping/traceroute/MTR summaries for a target, newest first.
+
+    Only available when the history store is enabled (HISTORY_ENABLED=true).
+    """
+    if not service.enabled:
+        raise HTTPException(status_code=404, detail="History store is disabled")
+    return await service.get_history(query)
@@ -1,15 +1,27 @@
+from collections.abc import AsyncGenerator
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import StreamingResponse
 
 from app.core.limiter import limiter
+from app.domain.history import get_history_store
 from app.domain.lookingglass import LookingGlassService
 from app.domain.lookingglass.models import MTRRequest, PingRequest, TracerouteRequest
 
 router = APIRouter(prefix="/lookingglass", tags=["LookingGlass"])
 
 
+def _with_history(
+    stream: AsyncGenerator[bytes, None], tool: str, target: str
+) -> AsyncGenerator[bytes, None]:
+    """Record the run in the history store when it is enabled."""
+    store = get_history_store()
+    if store is None:
+        return stream
+    return store.record_stream(stream, tool, target)
+
+
 @router.post("/ping")
 @limiter.limit("2/minute")
 async def ping(
@@ -26,7 +38,7 @@ async def ping(
     to prevent abuse. Only the target address can be specified by the user.
     """
     return StreamingResponse(
-        service.ping_stream(body),
+        _with_history(service.ping_stream(body), "ping", body.target),
         media_type="text/plain",
         headers={
             "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -49,7 +61,7 @@ async def ping6(
     Security: All parameters are server-controlled to prevent abuse.
     """
     return StreamingResponse(
-        service.ping6_stream(body),
+        _with_history(service.ping6_stream(body), "ping6", body.target),
         media_type="text/plain",
         headers={
             "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -72,7 +84,7 @@ async def traceroute(
     Security: Max hops and wait time are server-controlled to prevent abuse.
     """
     return StreamingResponse(
-        service.traceroute_stream(body),
+        _with_history(service.traceroute_stream(body), "traceroute", body.target),
         media_type="text/plain",
         headers={
             "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -95,7 +107,7 @@ async def traceroute6(
     Security: Max hops and wait time are server-controlled to prevent abuse.
     """
     return StreamingResponse(
-        service.traceroute6_stream(body),
+        _with_history(service.traceroute6_stream(body), "traceroute6", body.target),
         media_type="text/plain",
         headers={
             "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -121,7 +133,7 @@ async def mtr(
     Security: Report cycles and DNS settings are server-controlled.
     """
     return StreamingResponse(
-        service.mtr_stream(body),
+        _with_history(service.mtr_stream(body), "mtr", body.target),
         media_type="text/plain",
         headers={
             "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -144,7 +156,7 @@ async def mtr6(
     Security: Report cycles and DNS settings are server-controlled.
     """
     return StreamingResponse(
-        service.mtr6_stream(body),
+        _with_history(service.mtr6_stream(body), "mtr6", body.target),
         media_type="text/plain",
         headers={
             "Cache-Control": "no-cache, no-store, must-revalidate",
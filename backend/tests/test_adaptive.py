@@ -0,0 +1,55 @@
+import asyncio
+import sys
+import unittest
+
+from app.domain.lookingglass.adaptive import MTRMonitor
+from app.domain.lookingglass.parsers import summarize_output
+from app.domain.lookingglass.service import LookingGlassService
+
+# Three hops probed for ten cycles; hop 2 drops every other probe
+RAW_MTR_OUTPUT = "\n".join(
+    record
+    for cycle in range(1, 11)
+    for hop in range(3)
+    for record in (
+        f"x {hop} {cycle * 10 + hop}",
+        f"h {hop} 10.0.0.{hop}",
+        *(
+            []
+            if hop == 1 and cycle % 2 == 0
+            else [f"p {hop} {1000 + hop * 500 + cycle} {cycle * 10 + hop}"]
+        ),
+    )
+)
+
+
+class AdaptiveMTRReportTest(unittest.TestCase):
+    def test_rendered_report_is_parsed_into_hops(self) -> None:
+        cmd = [sys.executable, "-c", f"print({RAW_MTR_OUTPUT!r})"]
+
+        async def collect() -> list[bytes]:
+            service = LookingGlassService()
+            monitor = MTRMonitor(service._adaptive_bounds())
+            return [
+                chunk
+                async for chunk in service._execute_command_stream(cmd, "MTR", monitor)
+            ]
+
+        chunks = asyncio.run(collect())
+        # The report is streamed line by line, so per-chunk consumers see lines
+        self.assertTrue(all(chunk.count(b"\n") <= 1 for chunk in chunks))
+        per_chunk = [chunk.decode() for chunk in chunks]
+        self.assertIsNotNone(summarize_output("mtr", "x", per_chunk, 0.0, 1.0))
+
+        output = b"".join(chunks).decode().splitlines()
+        summary = summarize_output("mtr", "10.0.0.2", output, 0.0, 1.0)
+        assert summary is not None
+        self.assertEqual(
+            [hop.host for hop in summary.hops], [f"10.0.0.{i}" for i in range(3)]
+        )
+        self.assertGreater(summary.hops[1].loss_percent or 0.0, 0.0)
+        self.assertEqual(summary.loss_percent, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()